@@ -0,0 +1,261 @@
+"""
+Scaling benchmark for the Remember tool and the Memory Injection Filter.
+
+Runs add_memory -> update_memory -> forget_memory -> inlet cycles for many concurrent
+users against the local Memories stand-in, for each memory bank size, and reports per
+operation latency, allocation peaks and how long the event loop was blocked.
+
+    python benchmarks/bench_memory_plugins.py --sizes 10 1000 100000 --users 1 8 --json bench.json
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Dict, List
+
+import local_memories
+
+Memories = local_memories.install()
+
+from common import (
+    LoopLagMonitor,
+    build_report,
+    load_plugin,
+    max_rss_mib,
+    summarize,
+    write_report,
+)
+
+remember = load_plugin("tools/remember.py")
+memory_injection = load_plugin("functions/Memory-Injection-Filter.py")
+
+OPERATIONS = ("add_memory", "update_memory", "forget_memory", "inlet")
+
+
+async def discard_event(event: dict) -> None:
+    # Yield like a websocket send would, so concurrent users interleave
+    await asyncio.sleep(0)
+
+
+def make_body() -> dict:
+    return {
+        "model": "benchmark",
+        "messages": [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "What do you remember about me?"},
+        ],
+    }
+
+
+async def run_cycle(
+    tools, memory_filter, user_id: str, iteration: int
+) -> Dict[str, float]:
+    """Run one add -> update -> forget -> inlet cycle, leaving the memory bank size unchanged."""
+    user = {"id": user_id}
+    content = f"Benchmark memory {iteration} for {user_id}"
+    updated_content = f"{content} (updated)"
+    durations = {}
+
+    start = time.perf_counter()
+    await tools.add_memory(content, __user__=user, __event_emitter__=discard_event)
+    durations["add_memory"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await tools.update_memory(
+        updated_content, content, __user__=user, __event_emitter__=discard_event
+    )
+    durations["update_memory"] = time.perf_counter() - start
+
+    # update_memory re-inserts the memory, so it is the newest one for this user
+    memory_id = next(reversed(Memories.memories_by_user[user_id]))
+    start = time.perf_counter()
+    await tools.forget_memory(
+        memory_id, __user__=user, __event_emitter__=discard_event
+    )
+    durations["forget_memory"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await memory_filter.inlet(
+        make_body(), __user__=user, __event_emitter__=discard_event
+    )
+    durations["inlet"] = time.perf_counter() - start
+
+    return durations
+
+
+async def run_user(
+    tools,
+    memory_filter,
+    user_id: str,
+    iterations: int,
+    durations: Dict[str, List[float]],
+) -> None:
+    for iteration in range(iterations):
+        for operation, duration in (
+            await run_cycle(tools, memory_filter, user_id, iteration)
+        ).items():
+            durations[operation].append(duration)
+
+
+async def measure_allocations(tools, memory_filter, user_id: str) -> Dict[str, float]:
+    """Peak traced allocation of each operation in KiB, measured separately from the timings."""
+    peaks = {}
+    user = {"id": user_id}
+    content = f"Allocation probe for {user_id}"
+    updated_content = f"{content} (updated)"
+    operations = (
+        (
+            "add_memory",
+            lambda: tools.add_memory(
+                content, __user__=user, __event_emitter__=discard_event
+            ),
+        ),
+        (
+            "update_memory",
+            lambda: tools.update_memory(
+                updated_content,
+                content,
+                __user__=user,
+                __event_emitter__=discard_event,
+            ),
+        ),
+        (
+            "forget_memory",
+            lambda: tools.forget_memory(
+                next(reversed(Memories.memories_by_user[user_id])),
+                __user__=user,
+                __event_emitter__=discard_event,
+            ),
+        ),
+        (
+            "inlet",
+            lambda: memory_filter.inlet(
+                make_body(), __user__=user, __event_emitter__=discard_event
+            ),
+        ),
+    )
+
+    tracemalloc.start()
+    try:
+        for operation, call in operations:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await call()
+            peaks[operation] = (tracemalloc.get_traced_memory()[1] - baseline) / 1024
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+async def run_scenario(
+    bank_size: int, users: int, iterations: int, latency: float
+) -> dict:
+    Memories.clear()
+    Memories.latency = 0.0
+    user_ids = [f"user-{index}" for index in range(users)]
+    for user_id in user_ids:
+        Memories.seed(user_id, bank_size)
+    Memories.latency = latency
+
+    tools = remember.Tools()
+    memory_filter = memory_injection.Filter()
+    durations = {operation: [] for operation in OPERATIONS}
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_user(tools, memory_filter, user_id, iterations, durations)
+            for user_id in user_ids
+        )
+    )
+    wall_time = time.perf_counter() - start
+    loop_lag = await monitor.stop()
+
+    peaks = await measure_allocations(tools, memory_filter, user_ids[0])
+
+    return {
+        "bank_size": bank_size,
+        "users": users,
+        "iterations": iterations,
+        "latency_s": latency,
+        "wall_s": wall_time,
+        "max_rss_mib": max_rss_mib(),
+        "event_loop": loop_lag,
+        "operations": {
+            operation: {
+                **summarize(durations[operation]),
+                "peak_alloc_kib": peaks[operation],
+            }
+            for operation in OPERATIONS
+        },
+    }
+
+
+def print_result(result: dict) -> None:
+    lag = result["event_loop"]
+    print(
+        f"\nbank_size={result['bank_size']} users={result['users']} "
+        f"wall={result['wall_s']:.3f}s max_loop_lag={lag['max_lag_ms']:.2f}ms "
+        f"blocked={lag['blocked_ms']:.1f}ms max_rss={result['max_rss_mib']:.1f}MiB"
+    )
+    print(
+        f"  {'operation':<15}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'peak KiB':>12}"
+    )
+    for operation, stats in result["operations"].items():
+        print(
+            f"  {operation:<15}{stats['mean_ms']:>10.3f}{stats['p50_ms']:>10.3f}"
+            f"{stats['p95_ms']:>10.3f}{stats['max_ms']:>10.3f}{stats['peak_alloc_kib']:>12.1f}"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000, 10000, 100000],
+        help="Number of memories per user.",
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        nargs="+",
+        default=[1, 8],
+        help="Number of concurrent users.",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=5,
+        help="Cycles per user for each scenario.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds every Memories call blocks for, to simulate the database.",
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    results = []
+    for bank_size in args.sizes:
+        for users in args.users:
+            result = await run_scenario(
+                bank_size, users, args.iterations, args.latency
+            )
+            print_result(result)
+            results.append(result)
+
+    write_report(
+        build_report("memory_plugins", vars(args), results),
+        args.json,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
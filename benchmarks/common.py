@@ -0,0 +1,110 @@
+"""
+Helpers shared by the benchmark scripts: loading plugin files, timing statistics,
+event loop blocking measurement and the JSON report format.
+"""
+
+import asyncio
+import importlib.util
+import json
+import platform
+import resource
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_plugin(relative_path: str) -> ModuleType:
+    """Load a plugin file (e.g. "functions/Reasoning-injection.py") the way Open WebUI does, as a standalone module."""
+    path = REPO_ROOT / relative_path
+    name = "plugin_" + path.stem.replace("-", "_").lower()
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(durations: List[float]) -> Dict[str, Any]:
+    """Summarise durations in seconds as milliseconds."""
+    values = sorted(durations)
+    count = len(values)
+    return {
+        "count": count,
+        "mean_ms": (sum(values) / count * 1000) if count else 0.0,
+        "p50_ms": percentile(values, 0.5) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "max_ms": (values[-1] * 1000) if count else 0.0,
+    }
+
+
+class LoopLagMonitor:
+    """
+    Measures how long the event loop is blocked by repeatedly sleeping for `interval`
+    seconds and recording how late each wake-up is.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.lags: List[float] = []
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while self.running:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(time.perf_counter() - start - self.interval, 0.0))
+
+    def start(self) -> None:
+        self.lags = []
+        self.running = True
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> Dict[str, Any]:
+        # Let the last sleep finish, it records how long the final stretch blocked
+        self.running = False
+        await self.task
+        values = sorted(self.lags)
+        return {
+            "samples": len(values),
+            "p95_lag_ms": percentile(values, 0.95) * 1000,
+            "max_lag_ms": (values[-1] * 1000) if values else 0.0,
+            "blocked_ms": sum(values) * 1000,
+        }
+
+
+def max_rss_mib() -> float:
+    """Peak resident set size of this process in MiB."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB on Linux
+    if sys.platform == "darwin":
+        return max_rss / (1024 * 1024)
+    return max_rss / 1024
+
+
+def build_report(benchmark: str, config: Dict[str, Any], results: List[dict]) -> dict:
+    return {
+        "benchmark": benchmark,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": int(time.time()),
+        "config": config,
+        "results": results,
+    }
+
+
+def write_report(report: dict, output: Optional[str]) -> None:
+    if output:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {output}")
@@ -0,0 +1,149 @@
+"""
+Local stand-in for `open_webui.models.memories`, so the memory plugins can be run and
+profiled without an Open WebUI instance.
+
+`Memories` mirrors the methods of Open WebUI's `MemoriesTable` that the plugins use.
+It is synchronous like the real table, and `latency` blocks the calling thread on
+every call to simulate a database round trip. Call `install()` before loading a plugin
+so that its `from open_webui.models.memories import Memories` picks up the stand-in.
+"""
+
+import sys
+import time
+import types
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass(slots=True)
+class MemoryModel:
+    id: str
+    user_id: str
+    content: str
+    updated_at: int  # timestamp in epoch
+    created_at: int  # timestamp in epoch
+
+
+class LocalMemoriesTable:
+    def __init__(self, latency: float = 0.0, copy_on_read: bool = True):
+        """
+        latency: seconds every call blocks for, like a synchronous database query.
+        copy_on_read: return fresh model objects on every read, the way the real table
+        builds new models from database rows. Disable to only measure plugin overhead.
+        """
+        self.latency = latency
+        self.copy_on_read = copy_on_read
+        self.memories_by_user: Dict[str, Dict[str, MemoryModel]] = {}
+        self.user_id_by_memory_id: Dict[str, str] = {}
+
+    def _wait(self) -> None:
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _read(self, memory: MemoryModel) -> MemoryModel:
+        if not self.copy_on_read:
+            return memory
+        return MemoryModel(
+            memory.id,
+            memory.user_id,
+            memory.content,
+            memory.updated_at,
+            memory.created_at,
+        )
+
+    def _add(self, user_id: str, content: str, timestamp: int) -> MemoryModel:
+        memory = MemoryModel(str(uuid.uuid4()), user_id, content, timestamp, timestamp)
+        self.memories_by_user.setdefault(user_id, {})[memory.id] = memory
+        self.user_id_by_memory_id[memory.id] = user_id
+        return memory
+
+    def seed(self, user_id: str, count: int) -> None:
+        """Bulk-insert `count` memories for a user without any simulated latency."""
+        now = int(time.time())
+        for index in range(count):
+            self._add(
+                user_id,
+                f"Seeded memory {index} for {user_id}: the user likes topic {index}.",
+                now - count + index,
+            )
+
+    def clear(self) -> None:
+        self.memories_by_user.clear()
+        self.user_id_by_memory_id.clear()
+
+    def insert_new_memory(self, user_id: str, content: str) -> Optional[MemoryModel]:
+        self._wait()
+        return self._read(self._add(user_id, content, int(time.time())))
+
+    def update_memory_by_id(self, id: str, content: str) -> Optional[MemoryModel]:
+        self._wait()
+        memory = self._get(id)
+        if memory is None:
+            return None
+        memory.content = content
+        memory.updated_at = int(time.time())
+        return self._read(memory)
+
+    def get_memories(self) -> List[MemoryModel]:
+        self._wait()
+        return [
+            self._read(memory)
+            for memories in self.memories_by_user.values()
+            for memory in memories.values()
+        ]
+
+    def get_memories_by_user_id(self, user_id: str) -> List[MemoryModel]:
+        self._wait()
+        return [
+            self._read(memory)
+            for memory in self.memories_by_user.get(user_id, {}).values()
+        ]
+
+    def get_memory_by_id(self, id: str) -> Optional[MemoryModel]:
+        self._wait()
+        memory = self._get(id)
+        return self._read(memory) if memory is not None else None
+
+    def delete_memory_by_id(self, id: str) -> bool:
+        self._wait()
+        user_id = self.user_id_by_memory_id.pop(id, None)
+        if user_id is None:
+            return False
+        del self.memories_by_user[user_id][id]
+        return True
+
+    def delete_memories_by_user_id(self, user_id: str) -> bool:
+        self._wait()
+        for id in self.memories_by_user.pop(user_id, {}):
+            del self.user_id_by_memory_id[id]
+        return True
+
+    def delete_memory_by_id_and_user_id(self, id: str, user_id: str) -> bool:
+        self._wait()
+        if self.user_id_by_memory_id.get(id) != user_id:
+            return False
+        del self.user_id_by_memory_id[id]
+        del self.memories_by_user[user_id][id]
+        return True
+
+    def _get(self, id: str) -> Optional[MemoryModel]:
+        user_id = self.user_id_by_memory_id.get(id)
+        if user_id is None:
+            return None
+        return self.memories_by_user[user_id][id]
+
+
+Memories = LocalMemoriesTable()
+
+
+def install() -> LocalMemoriesTable:
+    """Register this module as `open_webui.models.memories` and return the shared table."""
+    for name in ("open_webui", "open_webui.models"):
+        if name not in sys.modules:
+            package = types.ModuleType(name)
+            package.__path__ = []
+            sys.modules[name] = package
+    sys.modules["open_webui.models.memories"] = sys.modules[__name__]
+    sys.modules["open_webui.models"].memories = sys.modules[__name__]
+    return Memories
@@ -0,0 +1,353 @@
+"""
+End-to-end profiler for the filter pipeline on long conversations.
+
+Runs the inlet, stream and outlet hooks of all three filters in the order Open WebUI
+does (every filter's inlet, then each stream chunk through every filter, then every
+filter's outlet) on synthetic conversations with embedded tool call blocks. Reports
+per hook wall time and allocations for each conversation length, plus scaling curves.
+
+    python benchmarks/profile_filter_pipeline.py --messages 50 200 800 --json profile.json
+"""
+
+import argparse
+import asyncio
+import copy
+import inspect
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import local_memories
+
+Memories = local_memories.install()
+
+from common import build_report, load_plugin, summarize, write_report
+
+# Filters in pipeline order, as (name, plugin file)
+PIPELINE = (
+    ("memory_injection", "functions/Memory-Injection-Filter.py"),
+    ("reasoning", "functions/Reasoning-injection.py"),
+    ("tool_call_formatting", "functions/Native-tool-call-formatting-outlet.py"),
+)
+
+HOOKS = ("inlet", "stream", "outlet")
+
+USER = {"id": "profile-user", "name": "Profiler", "role": "user"}
+
+WORDS = (
+    "the model should consider memory context when answering questions about "
+    "previous tool results and summarise search output for the user in detail"
+).split()
+
+
+async def discard_event(event: dict) -> None:
+    # Yield like a websocket send would
+    await asyncio.sleep(0)
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def make_tool_call_block(rng: random.Random, index: int) -> str:
+    tool_name = rng.choice(("web_search", "add_memory", "update_memory"))
+    return (
+        f'<details type="tool_calls" done="true" id="call_{index}" name="{tool_name}" '
+        f'arguments="{{&quot;query&quot;: &quot;{make_text(rng, 4)}&quot;}}" '
+        f'result="&quot;{make_text(rng, 40)}&quot;">\n'
+        f"<summary>Tool Executed</summary>\n"
+        f"</details>"
+    )
+
+
+def make_conversation(
+    message_count: int, tool_call_every: int, message_words: int, seed: int
+) -> List[dict]:
+    """A system prompt followed by alternating user and assistant messages."""
+    rng = random.Random(seed)
+    messages = [{"role": "system", "content": "You are a helpful assistant."}]
+    for index in range(message_count):
+        if index % 2 == 0:
+            messages.append({"role": "user", "content": make_text(rng, message_words)})
+            continue
+        content = make_text(rng, message_words)
+        if tool_call_every and (index // 2) % tool_call_every == 0:
+            content = f"{make_tool_call_block(rng, index)}\n{content}"
+        messages.append({"role": "assistant", "content": content})
+    return messages
+
+
+def make_stream_chunks(chunk_count: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": "chatcmpl-profile",
+            "object": "chat.completion.chunk",
+            "choices": [
+                {"index": 0, "delta": {"content": f" {rng.choice(WORDS)}"}}
+            ],
+        }
+        for _ in range(chunk_count)
+    ]
+
+
+class PipelineHook:
+    """
+    One hook of one filter. Like Open WebUI, only the extra parameters the hook
+    declares are passed to it. The signature is resolved once here, so it isn't part
+    of the timings.
+    """
+
+    def __init__(self, name: str, hook: Callable):
+        self.name = name
+        self.hook = hook
+        self.parameters = list(inspect.signature(hook).parameters)
+        self.is_async = inspect.iscoroutinefunction(hook)
+
+    def kwargs(self, extra_params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: value for key, value in extra_params.items() if key in self.parameters
+        }
+
+
+def build_pipeline(filters: List[tuple]) -> Dict[str, List[PipelineHook]]:
+    """The hooks of every filter, grouped by hook type in pipeline order."""
+    return {
+        hook: [
+            PipelineHook(name, getattr(plugin_filter, hook))
+            for name, plugin_filter in filters
+            if hasattr(plugin_filter, hook)
+        ]
+        for hook in HOOKS
+    }
+
+
+class Turn:
+    """The payloads of one chat turn, copied up front so copying isn't measured."""
+
+    def __init__(self, messages: List[dict], chunks: List[dict], turn: int):
+        metadata = {"chat_id": "profile-chat", "message_id": f"profile-message-{turn}"}
+        self.extra_params = {
+            "__user__": USER,
+            "__event_emitter__": discard_event,
+            "__metadata__": metadata,
+        }
+        self.inlet_body = {
+            "model": "profile",
+            "stream": True,
+            "messages": copy.deepcopy(messages),
+        }
+        self.chunks = copy.deepcopy(chunks)
+        response = "".join(chunk["choices"][0]["delta"]["content"] for chunk in chunks)
+        self.outlet_body = {
+            "model": "profile",
+            "chat_id": metadata["chat_id"],
+            "id": metadata["message_id"],
+            "messages": copy.deepcopy(messages)
+            + [{"role": "assistant", "content": response}],
+        }
+
+
+async def run_turn(
+    pipeline: Dict[str, List[PipelineHook]], turn: Turn, record: Callable
+) -> None:
+    """
+    Run one turn through the pipeline, passing each filter's result to the next.
+    record(name, hook, None) is called right before every hook call and its return
+    value is passed back as record(name, hook, start) right after it.
+    """
+    calls = {
+        hook: [(stage, stage.kwargs(turn.extra_params)) for stage in stages]
+        for hook, stages in pipeline.items()
+    }
+
+    body = turn.inlet_body
+    for stage, kwargs in calls["inlet"]:
+        start = record(stage.name, "inlet", None)
+        if stage.is_async:
+            body = await stage.hook(body, **kwargs)
+        else:
+            body = stage.hook(body, **kwargs)
+        record(stage.name, "inlet", start)
+
+    for event in turn.chunks:
+        for stage, kwargs in calls["stream"]:
+            start = record(stage.name, "stream", None)
+            if stage.is_async:
+                event = await stage.hook(event, **kwargs)
+            else:
+                event = stage.hook(event, **kwargs)
+            record(stage.name, "stream", start)
+
+    body = turn.outlet_body
+    for stage, kwargs in calls["outlet"]:
+        start = record(stage.name, "outlet", None)
+        if stage.is_async:
+            body = await stage.hook(body, **kwargs)
+        else:
+            body = stage.hook(body, **kwargs)
+        record(stage.name, "outlet", start)
+
+
+async def profile_length(
+    pipeline: Dict[str, List[PipelineHook]],
+    message_count: int,
+    args: argparse.Namespace,
+) -> dict:
+    messages = make_conversation(
+        message_count, args.tool_call_every, args.message_words, args.seed
+    )
+    chunks = make_stream_chunks(args.chunks, args.seed)
+
+    # Wall time of every hook call, stream hooks are called once per chunk
+    durations = {
+        (stage.name, hook): [] for hook, stages in pipeline.items() for stage in stages
+    }
+    turn_durations = []
+
+    def record_time(name: str, hook: str, start):
+        now = time.perf_counter()
+        if start is None:
+            return now
+        durations[(name, hook)].append(now - start)
+
+    for turn_index in range(args.warmup + args.turns):
+        turn = Turn(messages, chunks, turn_index)
+        start = time.perf_counter()
+        await run_turn(pipeline, turn, record_time)
+        if turn_index < args.warmup:
+            for values in durations.values():
+                values.clear()
+            continue
+        turn_durations.append(time.perf_counter() - start)
+
+    # Allocations: a separate traced turn, so tracing overhead doesn't skew the times
+    allocations = {
+        key: {"net_alloc_kib": 0.0, "peak_kib": 0.0} for key in durations
+    }
+
+    def record_allocations(name: str, hook: str, baseline):
+        if baseline is None:
+            tracemalloc.reset_peak()
+            return tracemalloc.get_traced_memory()[0]
+        current, peak = tracemalloc.get_traced_memory()
+        stats = allocations[(name, hook)]
+        stats["net_alloc_kib"] += max(current - baseline, 0) / 1024
+        stats["peak_kib"] = max(stats["peak_kib"], (peak - baseline) / 1024)
+
+    turn = Turn(messages, chunks, args.warmup + args.turns)
+    tracemalloc.start()
+    try:
+        await run_turn(pipeline, turn, record_allocations)
+    finally:
+        tracemalloc.stop()
+
+    hooks = {}
+    for (name, hook), values in durations.items():
+        if not values:
+            continue
+        stats = summarize(values)
+        stats["per_turn_ms"] = sum(values) / args.turns * 1000
+        stats.update(allocations[(name, hook)])
+        hooks.setdefault(name, {})[hook] = stats
+
+    return {
+        "messages": message_count,
+        "tool_call_blocks": sum(
+            message["content"].count('<details type="tool_calls"')
+            for message in messages
+        ),
+        "conversation_chars": sum(len(message["content"]) for message in messages),
+        "chunks": args.chunks,
+        "turn": summarize(turn_durations),
+        "hooks": hooks,
+    }
+
+
+def build_curves(results: List[dict]) -> Dict[str, List[List[float]]]:
+    """Per turn time of every hook against conversation length as [messages, ms]."""
+    curves = {}
+    for result in results:
+        for name, hooks in result["hooks"].items():
+            for hook, stats in hooks.items():
+                curves.setdefault(f"{name}.{hook}", []).append(
+                    [result["messages"], stats["per_turn_ms"]]
+                )
+    return curves
+
+
+def print_result(result: dict) -> None:
+    print(
+        f"\nmessages={result['messages']} tool_calls={result['tool_call_blocks']} "
+        f"chars={result['conversation_chars']} chunks={result['chunks']} "
+        f"turn_mean={result['turn']['mean_ms']:.3f}ms"
+    )
+    print(
+        f"  {'filter.hook':<30}{'ms/turn':>10}{'mean ms':>10}{'p95 ms':>10}"
+        f"{'net KiB':>12}{'peak KiB':>12}"
+    )
+    for name, hooks in result["hooks"].items():
+        for hook, stats in hooks.items():
+            print(
+                f"  {name + '.' + hook:<30}{stats['per_turn_ms']:>10.3f}"
+                f"{stats['mean_ms']:>10.4f}{stats['p95_ms']:>10.4f}"
+                f"{stats['net_alloc_kib']:>12.1f}{stats['peak_kib']:>12.1f}"
+            )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--messages",
+        type=int,
+        nargs="+",
+        default=[10, 50, 100, 200, 400, 800],
+        help="Conversation lengths to profile.",
+    )
+    parser.add_argument(
+        "--chunks", type=int, default=200, help="Stream chunks per turn."
+    )
+    parser.add_argument(
+        "--tool-call-every",
+        type=int,
+        default=3,
+        help="Embed a tool call block in every Nth assistant message. 0 disables.",
+    )
+    parser.add_argument(
+        "--message-words", type=int, default=60, help="Words per message."
+    )
+    parser.add_argument(
+        "--memories",
+        type=int,
+        default=100,
+        help="Memories in the user's bank for the Memory Injection Filter.",
+    )
+    parser.add_argument("--turns", type=int, default=5, help="Measured turns.")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured turns.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    Memories.clear()
+    Memories.seed(USER["id"], args.memories)
+    filters = [(name, load_plugin(path).Filter()) for name, path in PIPELINE]
+    pipeline = build_pipeline(filters)
+
+    results = []
+    for message_count in args.messages:
+        result = await profile_length(pipeline, message_count, args)
+        print_result(result)
+        results.append(result)
+
+    report = build_report(
+        "filter_pipeline",
+        {**vars(args), "pipeline": [name for name, _ in PIPELINE]},
+        results,
+    )
+    report["curves"] = build_curves(results)
+    write_report(report, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,16 +4,87 @@ author: Raphael
 author_url: https://github.com/raphael1-w
 description: Inject user memories into system prompt, allowing selection of which model has access to memories. This works even if the user's memories setting is off.
 required_open_webui_version: 0.5.0
-version: 1.1.0
+version: 1.1.1
 licence: MIT
 """
 
+import functools
+import inspect
+import logging
+import time
 from typing import Optional, Callable, Any
 from pydantic import BaseModel, Field
 from open_webui.models.memories import Memories
 from datetime import datetime
 
 
+log = logging.getLogger(__name__)
+
+# Maximum number of characters of a payload written to the log
+LOG_PAYLOAD_LIMIT = 500
+
+
+class LogPayload:
+    """Defers formatting a payload until a log record is actually emitted, and truncates it."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: Any):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        payload = self.payload
+        # Summarise the message history instead of dumping the whole chat
+        if isinstance(payload, dict) and isinstance(payload.get("messages"), list):
+            payload = {
+                **payload,
+                "messages": f"<{len(payload['messages'])} messages>",
+            }
+        text = repr(payload)
+        if len(text) > LOG_PAYLOAD_LIMIT:
+            return f"{text[:LOG_PAYLOAD_LIMIT]}... ({len(text)} chars)"
+        return text
+
+
+def log_timing(hook: Callable) -> Callable:
+    """Logs the wall time of a hook at DEBUG level. Costs a single level check otherwise."""
+    if inspect.iscoroutinefunction(hook):
+
+        @functools.wraps(hook)
+        async def async_wrapper(*args, **kwargs):
+            if not log.isEnabledFor(logging.DEBUG):
+                return await hook(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await hook(*args, **kwargs)
+            finally:
+                log_hook_duration(hook.__name__, start)
+
+        return async_wrapper
+
+    @functools.wraps(hook)
+    def wrapper(*args, **kwargs):
+        if not log.isEnabledFor(logging.DEBUG):
+            return hook(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return hook(*args, **kwargs)
+        finally:
+            log_hook_duration(hook.__name__, start)
+
+    return wrapper
+
+
+def log_hook_duration(hook_name: str, start: float) -> None:
+    duration_ms = (time.perf_counter() - start) * 1000
+    log.debug(
+        "hook=%s duration_ms=%.3f",
+        hook_name,
+        duration_ms,
+        extra={"hook": hook_name, "duration_ms": duration_ms},
+    )
+
+
 class EventEmitter:
     def __init__(self, event_emitter: Callable[[dict], Any] = None):
         self.event_emitter = event_emitter
@@ -50,19 +121,20 @@ class Filter:
     def __init__(self):
         self.valves = self.Valves()
 
+    @log_timing
     async def inlet(
         self,
         body: dict,
         __user__: Optional[dict] = None,
         __event_emitter__: Optional[Callable[[dict], Any]] = None,
     ) -> dict:
-        print(f"inlet called: {body}")
+        log.debug("inlet called: %s", LogPayload(body))
         user_id = __user__.get("id")
 
         emitter = EventEmitter(__event_emitter__)
 
         if not user_id:
-            print("User ID not provided.")
+            log.warning("User ID not provided.")
             return body
 
         user_memories = Memories.get_memories_by_user_id(user_id)
@@ -108,14 +180,15 @@ class Filter:
         for message in body["messages"]:
             if message["role"] == "system":
                 message["content"] += f"\n\n{system_message}"
-                print(f"Injected system message: (appended)")
+                log.debug("Injected system message: (appended)")
                 return body
 
         # If no system message exists, create a new one
         body["messages"].insert(0, {"role": "system", "content": system_message})
-        print(f"Injected system message: (new)")
+        log.debug("Injected system message: (new)")
         return body
 
+    @log_timing
     def outlet(self, body: dict, __user__: Optional[dict] = None) -> dict:
         # Nothing is done in the outlet
         return body
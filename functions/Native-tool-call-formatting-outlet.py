@@ -4,13 +4,84 @@ author: Raphael
 author_url: https://github.com/raphael1-w
 description: Avoid confusing the model on native tool call syntax in subsequent messages by altering the <details> tag block from the native tool call response.
 required_open_webui_version: 0.6.0
-version: 1.1.0
+version: 1.1.1
 licence: GNU General Public License v3.0
 """
 
+import functools
+import inspect
+import logging
 import re
+import time
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Callable, Any
+
+
+log = logging.getLogger(__name__)
+
+# Maximum number of characters of a payload written to the log
+LOG_PAYLOAD_LIMIT = 500
+
+
+class LogPayload:
+    """Defers formatting a payload until a log record is actually emitted, and truncates it."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: Any):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        payload = self.payload
+        # Summarise the message history instead of dumping the whole chat
+        if isinstance(payload, dict) and isinstance(payload.get("messages"), list):
+            payload = {
+                **payload,
+                "messages": f"<{len(payload['messages'])} messages>",
+            }
+        text = repr(payload)
+        if len(text) > LOG_PAYLOAD_LIMIT:
+            return f"{text[:LOG_PAYLOAD_LIMIT]}... ({len(text)} chars)"
+        return text
+
+
+def log_timing(hook: Callable) -> Callable:
+    """Logs the wall time of a hook at DEBUG level. Costs a single level check otherwise."""
+    if inspect.iscoroutinefunction(hook):
+
+        @functools.wraps(hook)
+        async def async_wrapper(*args, **kwargs):
+            if not log.isEnabledFor(logging.DEBUG):
+                return await hook(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await hook(*args, **kwargs)
+            finally:
+                log_hook_duration(hook.__name__, start)
+
+        return async_wrapper
+
+    @functools.wraps(hook)
+    def wrapper(*args, **kwargs):
+        if not log.isEnabledFor(logging.DEBUG):
+            return hook(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return hook(*args, **kwargs)
+        finally:
+            log_hook_duration(hook.__name__, start)
+
+    return wrapper
+
+
+def log_hook_duration(hook_name: str, start: float) -> None:
+    duration_ms = (time.perf_counter() - start) * 1000
+    log.debug(
+        "hook=%s duration_ms=%.3f",
+        hook_name,
+        duration_ms,
+        extra={"hook": hook_name, "duration_ms": duration_ms},
+    )
 
 
 class Filter:
@@ -21,16 +92,19 @@ class Filter:
         self.valves = self.Valves()
         # print("Filter initialized") # Optional: for debugging
 
+    @log_timing
     def inlet(self, body: dict, __user__: Optional[dict] = None) -> dict:
-        # print(f"inlet called: {body}") # Optional: for debugging
+        log.debug("inlet called: %s", LogPayload(body))
         return body
 
+    @log_timing
     def stream(self, event: dict) -> dict:
         # print(f"stream event: {event}") # Optional: for debugging
         return event
 
+    @log_timing
     def outlet(self, body: dict, __user__: Optional[dict] = None) -> dict:
-        # print(f"outlet called: {body}") # Keep print statements if needed for debugging
+        log.debug("outlet called: %s", LogPayload(body))
 
         # Define the start and end tags we want to find
         start_tag_marker = '<details type="tool_calls"'
@@ -69,8 +143,10 @@ class Filter:
                         )
                         if end_index == -1:
                             # Malformed content: found start but no end tag.
-                            print(
-                                f"Warning: Found '{start_tag_marker}' without matching '{end_tag_marker}' in message. Stopping replacement for this message."
+                            log.warning(
+                                "Found '%s' without matching '%s' in message. Stopping replacement for this message.",
+                                start_tag_marker,
+                                end_tag_marker,
                             )
                             # Append the rest from the last safe point to avoid data loss
                             modified_content += original_content[last_index:]
@@ -83,8 +159,9 @@ class Filter:
                         tag_end_index = original_content.find(">", start_index)
                         if tag_end_index == -1 or tag_end_index > end_index:
                             # Malformed tag or '>' appears after '</details>'? Skip this block safely.
-                            print(
-                                f"Warning: Could not find closing '>' for the tag starting at {start_index}. Skipping block."
+                            log.warning(
+                                "Could not find closing '>' for the tag starting at %d. Skipping block.",
+                                start_index,
                             )
                             modified_content += original_content[
                                 last_index : end_index + len(end_tag_marker)
@@ -133,6 +210,6 @@ class Filter:
 
         else:
             # Handle cases where 'messages' might be missing or not a list
-            print("Warning: 'messages' key not found or not a list in the body.")
+            log.warning("'messages' key not found or not a list in the body.")
 
         return body
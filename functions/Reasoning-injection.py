@@ -2,17 +2,88 @@
 title: Reasoning Event Emitter Filter
 author: Raphael Wong
 author_url: https://github.com/raphael1-w
-description: Emits a "Thinking..." event on inlet, then updates it with the elapsed time (in sec or min/sec) when the first stream chunk arrives.
+description: Emits a "Thinking..." event on inlet, keeps it updated with the elapsed time while the model is reasoning, then shows the total time (in sec or min/sec) when the first stream chunk arrives.
 required_open_webui_version: 0.5.17
-version: 1.0.0
+version: 1.1.1
 licence: GNU General Public License v3.0
 """
 
+import asyncio
+import functools
+import inspect
+import logging
 import time
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict
 from pydantic import BaseModel, Field
 
 
+log = logging.getLogger(__name__)
+
+# Maximum number of characters of a payload written to the log
+LOG_PAYLOAD_LIMIT = 500
+
+
+class LogPayload:
+    """Defers formatting a payload until a log record is actually emitted, and truncates it."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: Any):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        payload = self.payload
+        # Summarise the message history instead of dumping the whole chat
+        if isinstance(payload, dict) and isinstance(payload.get("messages"), list):
+            payload = {
+                **payload,
+                "messages": f"<{len(payload['messages'])} messages>",
+            }
+        text = repr(payload)
+        if len(text) > LOG_PAYLOAD_LIMIT:
+            return f"{text[:LOG_PAYLOAD_LIMIT]}... ({len(text)} chars)"
+        return text
+
+
+def log_timing(hook: Callable) -> Callable:
+    """Logs the wall time of a hook at DEBUG level. Costs a single level check otherwise."""
+    if inspect.iscoroutinefunction(hook):
+
+        @functools.wraps(hook)
+        async def async_wrapper(*args, **kwargs):
+            if not log.isEnabledFor(logging.DEBUG):
+                return await hook(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await hook(*args, **kwargs)
+            finally:
+                log_hook_duration(hook.__name__, start)
+
+        return async_wrapper
+
+    @functools.wraps(hook)
+    def wrapper(*args, **kwargs):
+        if not log.isEnabledFor(logging.DEBUG):
+            return hook(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return hook(*args, **kwargs)
+        finally:
+            log_hook_duration(hook.__name__, start)
+
+    return wrapper
+
+
+def log_hook_duration(hook_name: str, start: float) -> None:
+    duration_ms = (time.perf_counter() - start) * 1000
+    log.debug(
+        "hook=%s duration_ms=%.3f",
+        hook_name,
+        duration_ms,
+        extra={"hook": hook_name, "duration_ms": duration_ms},
+    )
+
+
 # Helper function to format duration
 def format_duration(seconds: float) -> str:
     seconds = round(seconds)  # Round to nearest whole second for cleaner display
@@ -52,49 +123,97 @@ class EventEmitter:
             )
 
 
+# Requests older than this are assumed abandoned and their start time is dropped
+STALE_REQUEST_SECONDS = 3600
+
+
+def get_request_key(metadata: Optional[dict]) -> str:
+    # Key per-request state by message so concurrent chats don't interfere
+    if metadata:
+        return str(
+            metadata.get("message_id") or metadata.get("chat_id") or "default"
+        )
+    return "default"
+
+
 class Filter:
     class Valves(BaseModel):
         REASONING_TEXT: str = Field(
             default="Thinking...",
             description="Initial text to display while waiting for the model.",
         )
+        TICKER_TEXT: str = Field(
+            default="Thinking for {duration}...",
+            description="Text shown while the model is still reasoning. {duration} is replaced with the elapsed time.",
+        )
+        TICKER_INTERVAL: float = Field(
+            default=5.0,
+            description="Seconds between elapsed-time updates while waiting for the first chunk. Set to 0 to disable.",
+        )
+        TICKER_MAX_DURATION: float = Field(
+            default=300.0,
+            description="Stop updating the elapsed time after this many seconds. This is the only limit on how long updates continue after the user stops a response before its first chunk.",
+        )
+        MAX_CONCURRENT_TICKERS: int = Field(
+            default=64,
+            description="Maximum number of requests that get elapsed-time updates at once. Further requests only show the initial text.",
+        )
 
     def __init__(self):
         self.valves = self.Valves()
-        self.start_time: Optional[float] = None
-        self.first_chunk_received: bool = False
+        # Start time of every request still waiting for its first chunk
+        self.start_times: Dict[str, float] = {}
+        self.tickers: Dict[str, asyncio.Task] = {}
 
+    @log_timing
     async def inlet(
         self,
         body: dict,
         __event_emitter__: Optional[Callable[[dict], Any]] = None,
         __user__: Optional[dict] = None,
+        __metadata__: Optional[dict] = None,
     ) -> dict:
-        print(f"inlet called: {body}")
-        self.start_time = time.time()
-        self.first_chunk_received = False
+        log.debug("inlet called: %s", LogPayload(body))
+        start_time = time.time()
+        request_key = get_request_key(__metadata__)
+        # A retried request reuses the message id, so drop any leftover ticker first
+        self.stop_ticker(request_key)
+        self.drop_stale_requests(start_time)
+        self.start_times[request_key] = start_time
         emitter = EventEmitter(__event_emitter__)
         if __event_emitter__:
-            print(f"Emitting initial status: {self.valves.REASONING_TEXT}")
+            log.debug("Emitting initial status: %s", self.valves.REASONING_TEXT)
             await emitter.emit(
                 description=self.valves.REASONING_TEXT,
                 status="in_progress",
                 done=False,
             )
+            self.start_ticker(
+                request_key, emitter, start_time, asyncio.current_task()
+            )
         else:
-            print("Event emitter not provided in inlet.")
+            log.debug("Event emitter not provided in inlet.")
         return body
 
+    @log_timing
     async def stream(
         self,
         event: dict,
         __event_emitter__: Optional[Callable[[dict], Any]] = None,
         __user__: Optional[dict] = None,
+        __metadata__: Optional[dict] = None,
     ) -> dict:
-        if self.start_time is not None and not self.first_chunk_received:
+        if not self.start_times:
+            return event
+
+        request_key = get_request_key(__metadata__)
+        start_time = self.start_times.pop(request_key, None)
+        if start_time is not None:
+            # Wait for the ticker to finish so a late update can't overwrite the final status
+            await self.wait_stop_ticker(request_key)
+
             end_time = time.time()
-            duration_seconds = end_time - self.start_time
-            self.first_chunk_received = True
+            duration_seconds = end_time - start_time
 
             # Format the duration using the helper function
             formatted_duration = format_duration(duration_seconds)
@@ -104,19 +223,130 @@ class Filter:
 
             emitter = EventEmitter(__event_emitter__)
             if __event_emitter__:
-                print(f"Emitting thinking time status: {final_message}")
+                log.debug("Emitting thinking time status: %s", final_message)
                 await emitter.emit(
                     description=final_message,
                     status="completed",
                     done=True,
                 )
             else:
-                print("Event emitter not provided in stream for time update.")
+                log.debug("Event emitter not provided in stream for time update.")
 
         return event
 
-    def outlet(self, body: dict, __user__: Optional[dict] = None) -> dict:
-        self.start_time = None
-        self.first_chunk_received = False
-        # print(f"outlet called: {body}") # Optional: keep for debugging
+    @log_timing
+    def outlet(
+        self,
+        body: dict,
+        __user__: Optional[dict] = None,
+        __metadata__: Optional[dict] = None,
+    ) -> dict:
+        request_key = get_request_key(__metadata__)
+        self.stop_ticker(request_key)
+        self.start_times.pop(request_key, None)
+        log.debug("outlet called: %s", LogPayload(body))
         return body
+
+    def start_ticker(
+        self,
+        request_key: str,
+        emitter: EventEmitter,
+        start_time: float,
+        request_task: Optional[asyncio.Task] = None,
+    ) -> None:
+        """
+        Starts the elapsed-time ticker for a request. The ticker stops on the first stream
+        chunk, in the outlet, when emitting a status fails, when request_task (the task
+        that ran the inlet) is cancelled or raises, or after TICKER_MAX_DURATION.
+
+        request_task only catches failures before the response is handed off, such as
+        the model request itself raising. Open WebUI streams the response from a separate
+        task and the inlet's task returns normally, so a user stopping the response is
+        not seen here and is only bounded by TICKER_MAX_DURATION.
+        """
+        if self.valves.TICKER_INTERVAL <= 0:
+            return
+        if len(self.tickers) >= self.valves.MAX_CONCURRENT_TICKERS:
+            log.info(
+                "Ticker limit (%d) reached, not updating elapsed time.",
+                self.valves.MAX_CONCURRENT_TICKERS,
+            )
+            return
+
+        task = asyncio.create_task(self.run_ticker(emitter, start_time))
+        self.tickers[request_key] = task
+
+        def stop_on_request_failure(finished_request: asyncio.Task) -> None:
+            # Stream and outlet won't run for a failed request
+            if finished_request.cancelled() or finished_request.exception():
+                log.debug("Request failed, stopping ticker %s", request_key)
+                task.cancel()
+                if self.tickers.get(request_key) is task:
+                    self.start_times.pop(request_key, None)
+
+        def remove_ticker(finished_task: asyncio.Task) -> None:
+            # Only remove our own entry, a newer ticker may have replaced it
+            if self.tickers.get(request_key) is finished_task:
+                del self.tickers[request_key]
+            # Don't leave a callback behind on a long-lived request task
+            if request_task is not None:
+                request_task.remove_done_callback(stop_on_request_failure)
+
+        task.add_done_callback(remove_ticker)
+        if request_task is not None:
+            request_task.add_done_callback(stop_on_request_failure)
+
+    def drop_stale_requests(self, now: float) -> None:
+        # Requests that were stopped before their first chunk never reach stream or outlet
+        stale_keys = [
+            key
+            for key, start_time in self.start_times.items()
+            if now - start_time > STALE_REQUEST_SECONDS
+        ]
+        for key in stale_keys:
+            del self.start_times[key]
+
+    def stop_ticker(self, request_key: str) -> Optional[asyncio.Task]:
+        task = self.tickers.pop(request_key, None)
+        if task is not None:
+            task.cancel()
+        return task
+
+    async def wait_stop_ticker(self, request_key: str) -> None:
+        task = self.stop_ticker(request_key)
+        if task is not None:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_ticker(self, emitter: EventEmitter, start_time: float) -> None:
+        interval = self.valves.TICKER_INTERVAL
+        next_tick = start_time + interval
+        last_description = None
+        try:
+            while True:
+                await asyncio.sleep(max(next_tick - time.time(), 0))
+                elapsed = time.time() - start_time
+                if elapsed > self.valves.TICKER_MAX_DURATION:
+                    return
+
+                description = self.valves.TICKER_TEXT.format(
+                    duration=format_duration(elapsed)
+                )
+                # Coalesce: only emit when the displayed text actually changes
+                if description != last_description:
+                    await emitter.emit(
+                        description=description,
+                        status="in_progress",
+                        done=False,
+                    )
+                    last_description = description
+
+                # Skip ticks missed while the emit was in flight instead of queueing them up
+                while next_tick <= time.time():
+                    next_tick += interval
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning("Stopping elapsed-time ticker after error: %s", e)
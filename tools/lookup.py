@@ -5,20 +5,134 @@ author_url: https://github.com/raphael1-w
 description: Search the web for information.
 required_open_webui_version: 0.6.0
 requirements: httpx, lxml-html-clean
-version: 0.9.1
+version: 0.10.0
 licence: MIT
 """
 
 import httpx
 from pydantic import BaseModel, Field
-from typing import Optional, Callable, Awaitable, List
+from typing import Optional, Callable, Awaitable, List, Any
 import asyncio
+import functools
+import inspect
+import logging
 import os
 import requests
 import urllib.parse
 import time
 
 
+log = logging.getLogger(__name__)
+
+# Maximum number of characters of a payload written to the log
+LOG_PAYLOAD_LIMIT = 500
+
+
+class LogPayload:
+    """Defers formatting a payload until a log record is actually emitted, and truncates it."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: Any):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        payload = self.payload
+        # Summarise the message history instead of dumping the whole chat
+        if isinstance(payload, dict) and isinstance(payload.get("messages"), list):
+            payload = {
+                **payload,
+                "messages": f"<{len(payload['messages'])} messages>",
+            }
+        text = repr(payload)
+        if len(text) > LOG_PAYLOAD_LIMIT:
+            return f"{text[:LOG_PAYLOAD_LIMIT]}... ({len(text)} chars)"
+        return text
+
+
+def log_timing(hook: Callable) -> Callable:
+    """Logs the wall time of a hook at DEBUG level. Costs a single level check otherwise."""
+    if inspect.iscoroutinefunction(hook):
+
+        @functools.wraps(hook)
+        async def async_wrapper(*args, **kwargs):
+            if not log.isEnabledFor(logging.DEBUG):
+                return await hook(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await hook(*args, **kwargs)
+            finally:
+                log_hook_duration(hook.__name__, start)
+
+        return async_wrapper
+
+    @functools.wraps(hook)
+    def wrapper(*args, **kwargs):
+        if not log.isEnabledFor(logging.DEBUG):
+            return hook(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return hook(*args, **kwargs)
+        finally:
+            log_hook_duration(hook.__name__, start)
+
+    return wrapper
+
+
+def log_hook_duration(hook_name: str, start: float) -> None:
+    duration_ms = (time.perf_counter() - start) * 1000
+    log.debug(
+        "hook=%s duration_ms=%.3f",
+        hook_name,
+        duration_ms,
+        extra={"hook": hook_name, "duration_ms": duration_ms},
+    )
+
+
+class BufferedEventEmitter:
+    """
+    Buffers citation events until flush(), which hands them to a background task so
+    the caller can carry on (e.g. with the next search) while they are sent. Batches
+    are sent in order. close() sends whatever is left and waits until it has been sent.
+    """
+
+    def __init__(self, event_emitter: Optional[Callable[[dict], Any]] = None):
+        self.event_emitter = event_emitter
+        self.buffer: List[dict] = []
+        self.sending: Optional[asyncio.Task] = None
+
+    async def emit(self, event: dict) -> None:
+        if not self.event_emitter:
+            return
+
+        if event.get("type") != "citation":
+            # Send other events straight away, after anything already buffered
+            await self.close()
+            await self.event_emitter(event)
+            return
+
+        self.buffer.append(event)
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+        events = self.buffer
+        self.buffer = []
+        self.sending = asyncio.create_task(self.send(events, self.sending))
+
+    async def send(self, events: List[dict], previous: Optional[asyncio.Task]) -> None:
+        # Wait for the previous batch so events reach the UI in the order they were emitted
+        if previous is not None:
+            await previous
+        for event in events:
+            await self.event_emitter(event)
+
+    async def close(self) -> None:
+        self.flush()
+        if self.sending is not None:
+            await self.sending
+
+
 class Tools:
     class Valves(BaseModel):
         searxng_url: str = Field(
@@ -35,6 +149,7 @@ class Tools:
         self.valves = self.Valves()
         self.citation = False  # Disable automatic citations
 
+    @log_timing
     async def web_search(
         self,
         queries: List[str],
@@ -65,97 +180,109 @@ class Tools:
         seen_urls = {}  # Hashmap to store seen URLs
         duplicate_results = 0
         content_citations_list = []
+        emitter = BufferedEventEmitter(__event_emitter__)
 
-        for query in queries:
-            search_url = f"{searxng_url}/search"
-            params = {
-                "q": query,
-                "safesearch": int(safesearch),
-                "format": "json",
-            }
+        try:
+            for query in queries:
+                # Send the previous query's citations before waiting on the next search
+                emitter.flush()
 
-            try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(search_url, params=params, timeout=20)
-                    response.raise_for_status()
-                    data = response.json()
-
-                if "results" in data:
-                    results = data["results"]
-                    if not results:
-                        output += f"No results found for query: {query}\n"
-                        continue
-
-                    block_quote = ""
-                    result_count = 0  # for counting the result
-                    for result in results[:number_of_results_per_query]:
-                        url = result.get("url", "")
-                        if url and url not in seen_urls:
-                            seen_urls[url] = True  # Mark URL as seen
-                            title = result.get("title", "No Title")
-                            content = result.get("content", "No Content")
-                            if content:
-
-                                content = content.replace("[", "&lbrack;")
-                                content = content.replace("]", "&rbrack;")
-
-                                citation_number = result_count + 1
-
-                                block_quote += f"{citation_number}. [{title}]({url})\n"
-                                block_quote += f"{content}\n"
-                                result_count += 1
-
-                                await __event_emitter__(
-                                    {
-                                        "type": "citation",
-                                        "data": {
-                                            "document": [content],
-                                            "metadata": [
-                                                {"source": title},
-                                            ],
-                                            "source": {
-                                                "name": f"{citation_number}. {title}",
-                                                "url": url,
+                search_url = f"{searxng_url}/search"
+                params = {
+                    "q": query,
+                    "safesearch": int(safesearch),
+                    "format": "json",
+                }
+
+                try:
+                    async with httpx.AsyncClient() as client:
+                        response = await client.get(
+                            search_url, params=params, timeout=20
+                        )
+                        response.raise_for_status()
+                        data = response.json()
+
+                    if "results" in data:
+                        results = data["results"]
+                        if not results:
+                            output += f"No results found for query: {query}\n"
+                            continue
+
+                        block_quote = ""
+                        result_count = 0  # for counting the result
+                        for result in results[:number_of_results_per_query]:
+                            url = result.get("url", "")
+                            if url and url not in seen_urls:
+                                seen_urls[url] = True  # Mark URL as seen
+                                title = result.get("title", "No Title")
+                                content = result.get("content", "No Content")
+                                if content:
+
+                                    content = content.replace("[", "&lbrack;")
+                                    content = content.replace("]", "&rbrack;")
+
+                                    citation_number = result_count + 1
+
+                                    block_quote += (
+                                        f"{citation_number}. [{title}]({url})\n"
+                                    )
+                                    block_quote += f"{content}\n"
+                                    result_count += 1
+
+                                    await emitter.emit(
+                                        {
+                                            "type": "citation",
+                                            "data": {
+                                                "document": [content],
+                                                "metadata": [
+                                                    {"source": title},
+                                                ],
+                                                "source": {
+                                                    "name": f"{citation_number}. {title}",
+                                                    "url": url,
+                                                },
                                             },
-                                        },
-                                    }
-                                )
-                        else:
-                            duplicate_results += 1
-
-                    output += block_quote
-                else:
-                    output += f"Error: Unexpected response format from search engine for query: {query}\n"
-
-            except httpx.TimeoutException:
-                output += f"Error: Timeout connecting to SearXNG for query: {query}. Please check the URL and try again.\n"
-            except httpx.RequestError as e:
-                output += (
-                    f"Error connecting to search engine for query: {query}: {e}.\n"
-                )
-            except Exception as e:
-                output += f"An unexpected error occurred for query: {query}: {e}\n"
-
-        if duplicate_results > 0:
-            output += f"\n> {duplicate_results} results omitted. "
-
-        tool_tip_content = f"""Search {"query" if duplicate_results == 1 else "queries"}: {search_queries}
+                                        }
+                                    )
+                            else:
+                                duplicate_results += 1
+
+                        output += block_quote
+                    else:
+                        output += f"Error: Unexpected response format from search engine for query: {query}\n"
+
+                except httpx.TimeoutException:
+                    output += f"Error: Timeout connecting to SearXNG for query: {query}. Please check the URL and try again.\n"
+                except httpx.RequestError as e:
+                    output += (
+                        f"Error connecting to search engine for query: {query}: {e}.\n"
+                    )
+                except Exception as e:
+                    output += f"An unexpected error occurred for query: {query}: {e}\n"
+
+            if duplicate_results > 0:
+                output += f"\n> {duplicate_results} results omitted. "
+
+            tool_tip_content = f"""Search {"query" if duplicate_results == 1 else "queries"}: {search_queries}
         Number of results per search query: {number_of_results_per_query}
         {duplicate_results} {"result" if duplicate_results == 1 else "results"} omitted """
 
-        await __event_emitter__(
-            {
-                "type": "citation",
-                "data": {
-                    "document": [tool_tip_content],
-                    "metadata": [
-                        {"source": "Lookup"},
-                    ],
-                    "source": {
-                        "name": "🔎 Lookup",
+            await emitter.emit(
+                {
+                    "type": "citation",
+                    "data": {
+                        "document": [tool_tip_content],
+                        "metadata": [
+                            {"source": "Lookup"},
+                        ],
+                        "source": {
+                            "name": "🔎 Lookup",
+                        },
                     },
-                },
-            }
-        )
+                }
+            )
+        finally:
+            # Send anything still buffered, even if the search was interrupted
+            await emitter.close()
 
         return output
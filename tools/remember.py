@@ -4,16 +4,87 @@ author: Raphael Wong
 author_url: https://github.com/raphael1-w
 description: This tool allows the LLM to update the user's memory list, including adding new memories and consolidating existing ones.
 required_open_webui_version: 0.5.0
-version: 0.5.0
+version: 0.5.2
 licence: GNU General Public License v3.0
 """
 
+import functools
+import inspect
+import logging
+import time
 from typing import List, Literal, Optional, Callable, Any
 from pydantic import BaseModel, Field
 from open_webui.models.memories import Memories
 from datetime import datetime
 
 
+log = logging.getLogger(__name__)
+
+# Maximum number of characters of a payload written to the log
+LOG_PAYLOAD_LIMIT = 500
+
+
+class LogPayload:
+    """Defers formatting a payload until a log record is actually emitted, and truncates it."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: Any):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        payload = self.payload
+        # Summarise the message history instead of dumping the whole chat
+        if isinstance(payload, dict) and isinstance(payload.get("messages"), list):
+            payload = {
+                **payload,
+                "messages": f"<{len(payload['messages'])} messages>",
+            }
+        text = repr(payload)
+        if len(text) > LOG_PAYLOAD_LIMIT:
+            return f"{text[:LOG_PAYLOAD_LIMIT]}... ({len(text)} chars)"
+        return text
+
+
+def log_timing(hook: Callable) -> Callable:
+    """Logs the wall time of a hook at DEBUG level. Costs a single level check otherwise."""
+    if inspect.iscoroutinefunction(hook):
+
+        @functools.wraps(hook)
+        async def async_wrapper(*args, **kwargs):
+            if not log.isEnabledFor(logging.DEBUG):
+                return await hook(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await hook(*args, **kwargs)
+            finally:
+                log_hook_duration(hook.__name__, start)
+
+        return async_wrapper
+
+    @functools.wraps(hook)
+    def wrapper(*args, **kwargs):
+        if not log.isEnabledFor(logging.DEBUG):
+            return hook(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return hook(*args, **kwargs)
+        finally:
+            log_hook_duration(hook.__name__, start)
+
+    return wrapper
+
+
+def log_hook_duration(hook_name: str, start: float) -> None:
+    duration_ms = (time.perf_counter() - start) * 1000
+    log.debug(
+        "hook=%s duration_ms=%.3f",
+        hook_name,
+        duration_ms,
+        extra={"hook": hook_name, "duration_ms": duration_ms},
+    )
+
+
 class Tools:
     def __init__(self):
         self.citation = False  # Disable built-in citations
@@ -25,6 +96,7 @@ class Tools:
             description="Whether to include the updated memory bank in the return message.",
         )
 
+    @log_timing
     async def add_memory(
         self,
         content: str,
@@ -54,22 +126,23 @@ class Tools:
                     ]
                 )
 
-            await __event_emitter__(
-                {
-                    "type": "citation",
-                    "data": {
-                        "document": [
-                            f"Added new memory - {content} \n---\nUpdated memory bank: \n{content_string}"
-                        ],
-                        "metadata": [
-                            {"source": "Remember"},
-                        ],
-                        "source": {
-                            "name": "🧠 Remember",
+            if __event_emitter__:
+                await __event_emitter__(
+                    {
+                        "type": "citation",
+                        "data": {
+                            "document": [
+                                f"Added new memory - {content} \n---\nUpdated memory bank: \n{content_string}"
+                            ],
+                            "metadata": [
+                                {"source": "Remember"},
+                            ],
+                            "source": {
+                                "name": "🧠 Remember",
+                            },
                         },
-                    },
-                }
-            )
+                    }
+                )
 
             if self.valves.include_memory_list:
                 return f"Added new memory - {content} \nUpdated memory bank: \n{content_string}"
@@ -78,6 +151,7 @@ class Tools:
         else:
             return "Failed to add new memory."
 
+    @log_timing
     async def update_memory(
         self,
         new_content: str,
@@ -170,6 +244,7 @@ class Tools:
             # For now, report the specific failure.
             return f"Failed to update memory. Deleted old memory '{old_content}', but failed to add new memory '{new_content}'."
 
+    @log_timing
     async def forget_memory(
         self,
         memory_id: str,
@@ -205,22 +280,23 @@ class Tools:
                     ]
                 )
 
-            await __event_emitter__(
-                {
-                    "type": "citation",
-                    "data": {
-                        "document": [
-                            f"Deleted memory - {memory_content}\n---\nUpdated memory bank: \n{content_string}"
-                        ],
-                        "metadata": [
-                            {"source": "Remember"},
-                        ],
-                        "source": {
-                            "name": "🧠 Remember",
+            if __event_emitter__:
+                await __event_emitter__(
+                    {
+                        "type": "citation",
+                        "data": {
+                            "document": [
+                                f"Deleted memory - {memory_content}\n---\nUpdated memory bank: \n{content_string}"
+                            ],
+                            "metadata": [
+                                {"source": "Remember"},
+                            ],
+                            "source": {
+                                "name": "🧠 Remember",
+                            },
                         },
-                    },
-                }
-            )
+                    }
+                )
             if self.valves.include_memory_list:
                 return f"Deleted memory - {memory_content}\nUpdated memory bank: \n{content_string}"
             else: